@@ -4,6 +4,35 @@ import time
 from vfd import VFD  # Import VFD display functions
 from file_ops import FileOperations  # Import FileOperations module
 from keyboard import KeyboardInput  # Import Keyboard input module
+from gap_buffer import GapBuffer  # Import GapBuffer text buffer
+
+try:
+    from vfd_core import diff_runs  # Compiled helper, see vfd_core.pyx
+except ImportError:
+    def diff_runs(new, old, merge_gap):
+        """Pure Python fallback of vfd_core.diff_runs, returning (start, end) ranges of changed cells."""
+        runs = []
+        if new == old:
+            return runs
+        # XOR both frames as big integers to find the first and last changed cell in C,
+        # then only walk the cells in between
+        diff = int.from_bytes(new, "big") ^ int.from_bytes(old, "big")
+        first = len(new) - (diff.bit_length() + 7) // 8
+        last = len(new) - 1 - ((diff & -diff).bit_length() - 1) // 8
+        run_start = None
+        last_changed = None
+        for i in range(first, last + 1):
+            if new[i] == old[i]:
+                continue
+            if run_start is None:
+                run_start = i
+            elif i - last_changed - 1 > merge_gap:
+                runs.append((run_start, last_changed + 1))
+                run_start = i
+            last_changed = i
+        if run_start is not None:
+            runs.append((run_start, last_changed + 1))
+        return runs
 
 
 # The `VFDWordProcessor` class represents a word processor for VFD (Vacuum Fluorescent Display)
@@ -14,6 +43,19 @@ class VFDWordProcessor:
     VFD_BS = 0x08  # Backspace command for the VFD
     VFD_CR = 0x0D  # Carriage return command (start of line)
     VFD_LINEFEED = 0x0A  # Line feed (next row)
+    _NUL = 0x00  # Byte value of an empty cell
+    _NL = 0x0A  # Byte value of a newline in the text
+    _SPACE = 0x20  # Byte value of a space
+    _TICK = 0x60  # Byte value of '`', which stands in for a newline on the display
+    # Display geometry of the 40x2 VFD and the text buffer size, used everywhere below
+    COLS = 40  # Characters per row
+    ROWS = 2  # Rows on the display
+    SCREEN = COLS * ROWS  # Characters on the whole display
+    BUF_SIZE = 16384  # Size of the text buffer
+    _BLANK_SCREEN = b" " * SCREEN  # A blank screen, also sliced to pad short frames
+    # Translation table for the display: NUL shows as a space and newline as '`'
+    _DISPLAY_TRANS = bytes.maketrans(bytes([_NUL, _NL]), bytes([_SPACE, _TICK]))
+    RUN_MERGE_GAP = 2  # Unchanged cells between two runs that are cheaper to rewrite than to re-cursor
 
     def __init__(self, vfd_instance):
         self.vfd = vfd_instance
@@ -22,29 +64,23 @@ class VFDWordProcessor:
             self.vfd, self.keyboard_input
         )  # Initialize FileOperations
         self.open_filename = ""  # Opened file name
-        self.buffer = bytearray(16384)  # 16KB text buffer for storing text
-        self.buffer_pos = 0  # Current position in the buffer
-        self.used_buffer_size = 0  # Track how much of the buffer has been used
+        self.buffer = GapBuffer(self.BUF_SIZE)  # 16KB gap buffer for storing text
         self.visible_start = 0  # Start of visible window in the buffer
-        self.visible_end = 80  # End of visible window (40x2)
-        self.visible_text = (" " * 80)  # Visible text in the buffer
-        self.visible_old = (" " * 80)  # Old visible text in the buffer
+        self.visible_end = self.SCREEN  # End of visible window (40x2)
+        # Both frames are reused in place by update_display rather than rebuilt every call
+        self.visible_text = bytearray(self._BLANK_SCREEN)  # Visible text in the buffer
+        self.visible_old = bytearray(self._BLANK_SCREEN)  # Old visible text in the buffer
+        # Translation table for counting words: whitespace becomes a space, anything else an 'x'
+        self.word_table = bytes(0x20 if byte in b" \t\n\r\x0b\x0c" else 0x78 for byte in range(256))
         self.cursor_pos = 0  # Current cursor position on the screen
         self.buffer_altered = False  # Flag to track if buffer has been altered
         self.insert_mode = False  # Insert mode flag
-        self.vfd.init_display()  # Initialize the VFD display
+        self._display_dirty = False  # Visible text changed, the display needs a redraw
+        self._cursor_dirty = False  # Only the cursor moved, the display needs a set_cursor
+        self._notice_until = 0.0  # Monotonic time at which the notice on screen is cleared, 0 if none
 
-        # Welcome message
-        self.vfd.write("VFD Editor")
-        time.sleep(2)
-        self.vfd.clear()
-        self.update_display()
-
-    def run(self):
-        """
-        Main loop to read USB keyboard input, handle control keys, regular input, and update the display.
-        """
-        control_key_actions = {
+        # Key dispatch tables, built once so each key costs a single dict lookup
+        self._ctrl_actions = {
             "q": self.quit_editor,
             "s": self.save_file,
             "o": self.open_file,
@@ -52,23 +88,69 @@ class VFDWordProcessor:
             "w": self.show_word_count,
             "j": self.journal_entry
         }
+        self._key_actions = {
+            "KEY_INSERT": self.toggle_insert_mode,
+            "KEY_UP": self.move_cursor_up,
+            "KEY_DOWN": self.move_cursor_down,
+            "KEY_LEFT": self.move_cursor_left,
+            "KEY_RIGHT": self.move_cursor_right,
+            "KEY_ENTER": lambda: self.insert_char("\n"),
+            "KEY_SPACE": lambda: self.insert_char(" "),
+            "KEY_BACKSPACE": self.delete_char,
+        }
+        self.vfd.init_display()  # Initialize the VFD display
 
+        # Welcome message, cleared by the main loop
+        self.vfd.write("VFD Editor")
+        self.return_to_main_screen()
+
+    def run(self):
+        """
+        Main loop to read USB keyboard input, handle control keys, regular input, and update the display.
+        """
         while True:
-            key = self.keyboard_input.get_key()
+            # Wait for a key, but only until a notice on screen is due to be cleared
+            timeout = None
+            if self._notice_until:
+                timeout = max(0.0, self._notice_until - time.monotonic())
+            key = self.keyboard_input.get_key(timeout=timeout)
+
+            if key is not None:
+                self._dispatch(key)
+                # Apply every key that queued up meanwhile, so a burst costs a single redraw
+                for key in self.keyboard_input.drain():
+                    self._dispatch(key)
+            elif self._notice_until and time.monotonic() >= self._notice_until:
+                self.clear_notice()
+
+            if self._notice_until:
+                continue  # Leave the notice on screen, clear_notice redraws everything
+
+            # Only redraw when the visible text changed, otherwise just place the cursor
+            if self._display_dirty:
+                self.update_display()
+            elif self._cursor_dirty:
+                self.vfd.set_cursor(self.cursor_pos)
+                self._cursor_dirty = False
 
-            if self.keyboard_input.control_pressed:
-                if key in control_key_actions:
-                    control_key_actions[key]()  # Call the function mapped to the control key
-                    continue
+        self.cleanup()  # Cleanup GPIO before exiting
 
-            # Handle regular input and update display
-            self.handle_regular_input(key)
 
-            # Display is updated every loop unless handled in functions
-            self.update_display()
+    def _dispatch(self, key):
+        """Apply a single key press to the editor."""
+        if self._notice_until:
+            self.clear_notice()  # A keypress dismisses a notice early
 
-        self.cleanup()  # Cleanup GPIO before exiting
+        # Resolve the key to one handler; control keys without a shortcut act as regular input
+        ctrl = self.keyboard_input.control_pressed
+        handler = self._ctrl_actions.get(key) if ctrl else None
+        if handler is None:
+            handler = self._key_actions.get(key)
 
+        if handler:
+            handler()
+        elif len(key) == 1:
+            self.insert_char(key)
 
     def insert_char(self, char):
         """
@@ -80,123 +162,99 @@ class VFDWordProcessor:
         buffer or used to overwrite an existing character based on the current mode (insert/overwrite) of
         the buffer
         """
-        if self.buffer_pos < len(self.buffer) - 1:  # Ensure the buffer doesn't overflow
-            if self.insert_mode:
-                # Insert mode: Shift the buffer content to the right
-                self.buffer[self.buffer_pos + 1:] = self.buffer[self.buffer_pos:-1]
-            # Insert or overwrite the character
-            self.buffer[self.buffer_pos] = ord(char)
-            self.buffer_pos += 1
-        
+        if self.buffer.insert(char, overwrite=not self.insert_mode):  # False once the buffer is full
+            self.buffer_altered = True
+            self._display_dirty = True
+
         self.update_cursor_position()
 
     def delete_char(self):
-        """Delete the character at the current buffer position and update the cursor."""
-        if self.buffer_pos > 0:
-            self.buffer_pos -= 1
-            self.buffer[self.buffer_pos] = 0  # Clear the character
+        """Delete the character before the cursor and update the cursor."""
+        if self.buffer.delete():
+            self.buffer_altered = True
+            self._display_dirty = True
             self.update_cursor_position()
 
     def move_cursor_up(self):
-        """Move the cursor up by 1 row."""
-        if self.visible_start >= 40:
-            self.visible_start -= 40
-            self.visible_end -= 40
-        else:
-            self.buffer_pos = max(0, self.buffer_pos - 40)  # Move the cursor to the start of the buffer
-            self.update_cursor_position()
-        self.update_display()
+        """Move the cursor up by 1 row, staying in the same column."""
+        if self.buffer.cursor >= self.COLS:  # Already on the top row of the text otherwise
+            self.buffer.move_to(self.buffer.cursor - self.COLS)
+            self.update_cursor_position()  # Scrolls the window if the cursor left it
 
     def move_cursor_down(self):
-        """Move the cursor down by 1 row, ensuring it stays within the bounds of the buffer."""
-        buffer_size = self.calculate_used_buffer()  # Get the size of the used portion of the buffer
-
-        # If there's room to scroll down by a full row (40 characters)
-        if self.visible_end + 40 <= buffer_size:
-            self.visible_start += 40
-            self.visible_end += 40
-        # If near the end of the buffer, adjust to show the last visible row
-        elif self.visible_end < buffer_size:
-            self.visible_start = max(0, buffer_size - 40)
-            self.visible_end = buffer_size
-        else:
-            return  # Reached the end of the buffer, no further movement
-
-        # Ensure buffer_pos does not exceed the actual buffer content
-        self.buffer_pos = min(buffer_size, self.buffer_pos + 40)
-        
-        # Adjust cursor and display
-        self.update_cursor_position()
-        self.update_display()
-
+        """Move the cursor down by 1 row, stopping at the end of the text on the last row."""
+        if self.buffer.cursor < len(self.buffer):
+            self.buffer.move_to(self.buffer.cursor + self.COLS)  # Clamped to the end of the text
+            self.update_cursor_position()  # Scrolls the window if the cursor left it
 
     def move_cursor_left(self):
         """Move the cursor left by one position in the buffer if not at the start."""
-        if self.buffer_pos > 0:
-            self.buffer_pos -= 1  # Move the cursor one position left
+        if self.buffer.move_left():
             self.update_cursor_position()
 
 
     def move_cursor_right(self):
         """Move the cursor right by one position in the buffer if not at the end."""
-        if self.buffer_pos < len(self.buffer) - 1:
-            self.buffer_pos += 1  # Move the cursor one position right
+        if self.buffer.move_right():
             self.update_cursor_position()
 
 
-    def calculate_used_buffer(self):
-        """Calculate the amount of the buffer that is currently used."""
-        return sum(byte != 0 for byte in self.buffer)
+    def _text_loaded(self, size):
+        """Take the `size` bytes just loaded into the buffer as the text, with the cursor at the end."""
+        self.buffer.loaded(size)
+        self._display_dirty = True
+        self.update_cursor_position()  # Scroll the window to the cursor
 
     def update_cursor_position(self):
-        """Update the cursor position, ensuring it stays within the buffer bounds."""
-        buffer_size = self.calculate_used_buffer()
+        """Update the cursor position, scrolling the visible window by whole rows to keep the cursor on screen."""
+        # The text position is authoritative, the window and screen position are derived from its row
+        row = self.buffer.cursor // self.COLS
+        top_row = self.visible_start // self.COLS
+        if row < top_row:  # Cursor went above the screen, show its row at the top
+            top_row = row
+        elif row >= top_row + self.ROWS:  # Cursor went below the screen, show its row at the bottom
+            top_row = row - self.ROWS + 1
 
-        if self.buffer_pos > buffer_size:  # Ensure cursor doesn't go beyond used buffer
-            self.buffer_pos = buffer_size
+        if top_row * self.COLS != self.visible_start:
+            self.visible_start = top_row * self.COLS
+            self.visible_end = self.visible_start + self.SCREEN
+            self._display_dirty = True
+        self.cursor_pos = self.buffer.cursor - self.visible_start
 
-        self.cursor_pos = self.buffer_pos - self.visible_start
-
-        if self.cursor_pos < 0:
-            self.cursor_pos = 0
-        elif self.cursor_pos > 79:  # Move the visible window when cursor exceeds 79
-            self.visible_start += 40
-            self.visible_end += 40
-            self.cursor_pos = self.buffer_pos - self.visible_start
-
-        self.vfd.set_cursor(self.cursor_pos)
+        self._cursor_dirty = True
 
 
     def update_display(self):
         """Update the VFD display by replacing newline characters with '`' inline and reducing flicker."""
-        buffer_size = self.calculate_used_buffer()  # Calculate the used part of the buffer
-        self.visible_text = ""
-
-        # Build the visible_text by iterating over the visible buffer range
-        for i in range(self.visible_start, min(self.visible_end, buffer_size)):
-            char = self.buffer[i]
-            self.visible_text += "`" if char == ord("\n") else (chr(char) if char != 0 else " ")
-
-        # Ensure visible_text is exactly 80 characters long
-        self.visible_text = f"{self.visible_text:<80}"
-
-        # Compare the new visible_text with the old one and update only changed characters
-        for i, char in enumerate(self.visible_text):
-            if i >= len(self.visible_old) or self.visible_old[i] != char:
-                self.vfd.set_cursor(i)  # Move the cursor to the position of the difference
-                self.vfd.write(char)  # Write only the changed character
+        # Translate the visible text range in one pass and pad it to exactly one screen
+        frame = self.buffer.visible_slice(self.visible_start, self.visible_end).translate(self._DISPLAY_TRANS)
+        self.visible_text[:len(frame)] = frame
+        self.visible_text[len(frame):] = self._BLANK_SCREEN[len(frame):]
+
+        # Compare the new visible_text with the old one and write each run of changed characters,
+        # writing straight through short stretches of unchanged cells instead of re-cursoring
+        if self.visible_text != self.visible_old:
+            runs = diff_runs(self.visible_text, self.visible_old, self.RUN_MERGE_GAP)
+            # Each run costs a cursor command plus its characters; past the cost of one full
+            # screen write (a cursor command plus every cell), just rewrite the whole screen
+            if len(runs) + sum(end - start for start, end in runs) > 1 + self.SCREEN:
+                runs = [(0, self.SCREEN)]
+            for start, end in runs:
+                self.vfd.write_at(start, self.visible_text[start:end])
 
         # Update visible_old to reflect the current state
-        self.visible_old = self.visible_text
+        self.visible_old[:] = self.visible_text
 
         # Set cursor position to the current cursor_pos
         self.vfd.set_cursor(self.cursor_pos)
-    
+        self._display_dirty = False
+        self._cursor_dirty = False
+
     def count_words_in_buffer(self):
         """Return the count of words in the used portion of the buffer."""
-        # Decode the used buffer portion and split by whitespace to count words
-        used_buffer = self.buffer[:self.calculate_used_buffer()].decode("ascii", "ignore")
-        return len(used_buffer.split())
+        # Reduce the text to spaces and 'x's, then count every place a word starts
+        text = self.buffer.visible_slice(0, len(self.buffer)).translate(self.word_table)
+        return text.count(b" x") + text.startswith(b"x")
     
     def show_word_count(self):
         """Display the word count in the buffer."""
@@ -208,22 +266,25 @@ class VFDWordProcessor:
 
     def journal_entry(self):
         """Clear the buffer and screen, then save a new journal entry with a timestamped filename."""
-        # Clear the buffer and reset the position
-        self.buffer = bytearray(16384)
-        self.buffer_pos = 0
+        # Clear the buffer and reset the position, reusing the existing buffer
+        self.buffer.clear()
+        self.visible_start = 0
+        self.visible_end = self.SCREEN
+        self.cursor_pos = 0
+        self._display_dirty = True
         self.vfd.clear()
 
         # Create the filename using the current timestamp
         filename = time.strftime("%Y%m%dT%H%M%S") + ".txt"
 
         # Save the buffer as a new journal entry
-        self.open_filename = self.file_ops.save_file(self.buffer, filename)
+        self.open_filename = self._save_text(filename)
         self.buffer_altered = False
 
         # Inform the user about the new journal entry
         self.vfd.clear()
         self.vfd.write("New journal entry saved as:")
-        self.vfd.set_cursor(40)
+        self.vfd.set_cursor(self.COLS)
         self.vfd.write(f"{filename}")
         
         # Return to the main screen
@@ -232,21 +293,33 @@ class VFDWordProcessor:
 
     def save_file(self):
         """Save the buffer to a file."""
-        self.open_filename = self.file_ops.save_file(self.buffer, self.open_filename)
+        self.open_filename = self._save_text(self.open_filename)
         self.buffer_altered = False  # Reset buffer_altered flag after saving
         self.return_to_main_screen()
 
+    def _save_text(self, filename):
+        """Save the text straight from the buffer without copying it, returning the saved filename."""
+        cursor = self.buffer.cursor
+        filename = self.file_ops.save_file(self.buffer.dump_bytes(), filename)
+        self.buffer.move_to(cursor)  # dump_bytes moved the cursor to the end of the text
+        return filename
+
     def open_file(self):
         """Open a file and load its contents into the buffer."""
-        self.open_filename = self.file_ops.open_file(self.buffer)
-        self.buffer_pos = self.calculate_used_buffer()  # Reset buffer position to match the file size
+        self.open_filename, size = self.file_ops.open_file(self.buffer.load_bytes())
+        if self.open_filename:
+            self._text_loaded(size)  # Reset the cursor to the end of the loaded text
         self.buffer_altered = False  # The buffer is now synchronized with the file
         self.return_to_main_screen()
 
 
     def return_to_main_screen(self, delay=2):
-        """Clear the screen and return to the main editor after a short delay."""
-        time.sleep(delay)
+        """Leave the current notice on screen and return to the main editor after `delay` seconds."""
+        self._notice_until = time.monotonic() + delay
+
+    def clear_notice(self):
+        """Clear the notice from the screen and redraw the editor."""
+        self._notice_until = 0.0
         self.vfd.clear()
         self.vfd.write(self.visible_text)
         self.update_display()
@@ -263,41 +336,24 @@ class VFDWordProcessor:
 
     def open_file_chooser(self):
         """Open file chooser and reset buffer altered flag."""
-        self.file_ops.choose_file_from_list(self.buffer)
+        filename, size = self.file_ops.choose_file_from_list(self.buffer.load_bytes())
+        if filename:
+            self._text_loaded(size)
         self.buffer_altered = False
+        self.return_to_main_screen()
 
     def cleanup(self):
         """Cleanup resources before quitting."""
         self.vfd.cleanup()  # Ensure GPIO is cleaned up properly
+        self.keyboard_input.close()  # Release the grabbed keyboard
+        self.buffer.close()  # Release the text buffer mapping
         
-    def handle_regular_input(self, key):
-        """
-        Handle non-control key input, such as moving the cursor or inserting text.
-        """
-        if key == "KEY_INSERT":
-            self.insert_mode = not self.insert_mode
-            self.vfd.write(f"Insert Mode: {'ON' if self.insert_mode else 'OFF'}")
-            time.sleep(1)
-        elif key == "KEY_UP":
-            self.move_cursor_up()
-        elif key == "KEY_DOWN":
-            self.move_cursor_down()
-        elif key == "KEY_LEFT":
-            self.move_cursor_left()
-        elif key == "KEY_RIGHT":
-            self.move_cursor_right()
-        elif key == "KEY_ENTER":
-            self.insert_char("\n")
-            self.buffer_altered = True
-        elif key == "KEY_SPACE":
-            self.insert_char(" ")
-            self.buffer_altered = True
-        elif key == "KEY_BACKSPACE":
-            self.delete_char()
-            self.buffer_altered = True
-        elif key is not None and len(key) == 1:
-            self.insert_char(key)
-            self.buffer_altered = True
+    def toggle_insert_mode(self):
+        """Switch between insert and overwrite mode and briefly show the new mode."""
+        self.insert_mode = not self.insert_mode
+        self.vfd.clear()
+        self.vfd.write(f"Insert Mode: {'ON' if self.insert_mode else 'OFF'}")
+        self.return_to_main_screen(delay=1)
 
 
 
@@ -1,5 +1,9 @@
 ''' File operations for the VFD Editor. '''
 import os
+
+__all__ = ["FileOperations"]
+
+
 class FileOperations:
     """
     File operations for the VFD Editor.
@@ -45,23 +49,22 @@ class FileOperations:
         return os.path.join(self.base_dir, filename) if filename else None
 
     def save_file(self, buffer, filename=None):
-        """Save the used part of the buffer to a file and display the number of bytes written."""
-        self.vfd.clear()
+        """
+        Save the text to a file and display the number of bytes written.
 
-        # Calculate the used portion of the buffer
-        used_buffer = buffer[
-            : buffer.find(0)
-        ]  # Find the first zero byte and slice up to that point
+        :param buffer: A bytes-like object (e.g. a memoryview) holding exactly the text to save
+        :param filename: The file to save to, or None to ask the user
+        :return: The filename saved to, or None if nothing was saved
+        """
+        self.vfd.clear()
 
         if not filename:
             filename = self.get_filename_from_user("Save file as: ")
 
         if filename:
             try:
-                with open(filename, "w", encoding="UTF-8") as f:
-                    bytes_written = f.write(
-                        used_buffer.decode("ascii")
-                    )  # Write only the used part
+                with open(filename, "wb") as f:
+                    bytes_written = f.write(buffer)  # Write the text without copying it
                 self.vfd.write(f"File saved as {os.path.basename(filename)}.")
                 self.vfd.set_cursor(40)
                 self.vfd.write(f"{bytes_written} bytes written")
@@ -71,24 +74,36 @@ class FileOperations:
         return None
 
     def open_file(self, buffer, filename=None):
-        """Open a file and load its contents into the buffer."""
+        """
+        Open a file and read its contents straight into the front of the buffer.
+
+        :param buffer: A writable bytes-like object (e.g. a memoryview) to read into
+        :param filename: The file to open, or None to ask the user
+        :return: A tuple of the filename and the number of bytes read, or (None, 0) on failure or if the
+            file doesn't fit in the buffer
+        """
         self.vfd.clear()
         if not filename:
             filename = self.get_filename_from_user("Open file: ")
 
         if filename and self.file_exists(filename):
             try:
-                with open(filename, "r", encoding="UTF-8") as f:
-                    content = f.read()
-                buffer[:] = bytearray(content.encode("ascii"))
+                with open(filename, "rb") as f:
+                    # A partial read would be taken as the whole file and cut it short on the next save
+                    if os.fstat(f.fileno()).st_size > len(buffer):
+                        self.vfd.write(f"File too large: {os.path.basename(filename)}")
+                        self.vfd.set_cursor(40)
+                        self.vfd.write(f"The limit is {len(buffer)} bytes")
+                        return None, 0
+                    bytes_read = f.readinto(buffer)  # Fill in place so the buffer keeps its size
                 self.vfd.clear()
                 self.vfd.write(f"Loaded {os.path.basename(filename)}")
-                return filename
+                return filename, bytes_read
             except (IOError, OSError) as e:
                 self.vfd.write(f"Error loading file: {str(e)}")
         else:
             self.vfd.write("File not found.")
-        return None
+        return None, 0
 
     def file_exists(self, filename):
         """Check if a file exists."""
@@ -98,32 +113,29 @@ class FileOperations:
         """Display a list of files in the base directory and allow the user to choose one."""
         self.vfd.clear()
 
-        # Get the list of files in the base directory
-        files = [
-            f
-            for f in os.listdir(self.base_dir)
-            if os.path.isfile(os.path.join(self.base_dir, f))
-        ]
+        # Get the names and full paths of the files in the base directory in one directory scan
+        with os.scandir(self.base_dir) as entries:
+            files = [(entry.name, entry.path) for entry in entries if entry.is_file()]
 
         if not files:
             self.vfd.write("No files available.")
-            return None
+            return None, 0
 
         index = 0  # Start with the first file selected
+        shown_index = -1  # Index of the file on the screen, so other keys don't repaint it
         total_files = len(files)
 
         while True:
-            # Display the current file selection (one file per line)
-            self.vfd.clear()
-
-            # Only display the selected file on the screen
-            selected_file = files[index]
-            self.vfd.write(f"> {selected_file:<40}")  # Display the selected file
+            if index != shown_index:
+                # Only display the selected file on the screen
+                self.vfd.clear()
+                self.vfd.write(f"> {files[index][0]:<40}")  # Display the selected file
+                shown_index = index
 
             key = self.keyboard_input.get_key()
 
             if key == "KEY_ENTER":  # Confirm selection
-                selected_file_path = os.path.join(self.base_dir, selected_file)
+                selected_file, selected_file_path = files[index]
                 self.vfd.clear()
                 self.vfd.write(f"Selected: {selected_file}")
                 return self.open_file(buffer, selected_file_path)  # Open the selected file
@@ -133,4 +145,4 @@ class FileOperations:
                 index = (index + 1) % total_files  # Wrap around if at the bottom
             elif key == "KEY_ESC":  # Cancel selection
                 self.vfd.write("Selection cancelled.")
-                return None
+                return None, 0
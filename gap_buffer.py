@@ -0,0 +1,143 @@
+''' Gap buffer holding the text for the VFD Editor. '''
+import ctypes
+import mmap
+
+
+class GapBuffer:
+    """
+    Text buffer with a gap at the cursor, so typing and deleting never shift the rest of the text.
+
+    Text before the cursor is stored at the front of a fixed size anonymous mapping and text after
+    the cursor at the back; the unused space in between is the gap.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes an empty GapBuffer.
+
+        :param size: The capacity of the buffer in bytes
+        """
+        self.buffer = mmap.mmap(-1, size)  # Zero filled pages, only backed by RAM once written
+        self.gap_start = 0  # Start of the gap, which is also the cursor position in the text
+        self.gap_end = size  # End of the gap; text after the cursor lives past here
+        # Raw view of the buffer for in-place moves; it also pins the buffer at its fixed size
+        self._buffer_c = (ctypes.c_char * size).from_buffer(self.buffer)
+        self._buffer_addr = ctypes.addressof(self._buffer_c)
+
+    def __len__(self):
+        """Return the length of the text."""
+        return self.gap_start + len(self.buffer) - self.gap_end
+
+    def __getitem__(self, pos):
+        """Return the byte at text position `pos`."""
+        if pos < self.gap_start:
+            return self.buffer[pos]
+        return self.buffer[pos + self.gap_end - self.gap_start]
+
+    @property
+    def cursor(self):
+        """The cursor position in the text."""
+        return self.gap_start
+
+    def insert(self, char, overwrite=False):
+        """
+        Insert a character at the cursor and move the cursor past it.
+
+        :param char: The character to insert
+        :param overwrite: Replace the character after the cursor instead of inserting before it
+        :return: True if the text changed, False if the buffer is full
+        """
+        if overwrite and self.gap_end < len(self.buffer):
+            self.gap_end += 1  # Swallow the character after the cursor into the gap
+        if self.gap_start == self.gap_end:
+            return False
+        self.buffer[self.gap_start] = ord(char)  # Write into the gap, nothing needs shifting
+        self.gap_start += 1
+        return True
+
+    def delete(self):
+        """
+        Delete the character before the cursor.
+
+        :return: True if a character was deleted, False if the cursor is at the start
+        """
+        if self.gap_start == 0:
+            return False
+        self.gap_start -= 1  # Widen the gap over the deleted character
+        return True
+
+    def move_to(self, pos):
+        """Move the cursor to text position `pos`, copying only the bytes the gap crosses."""
+        pos = max(0, min(pos, len(self)))
+        if pos < self.gap_start:
+            count = self.gap_start - pos
+            self._shift(self.gap_end - count, pos, count)
+            self.gap_start -= count
+            self.gap_end -= count
+        elif pos > self.gap_start:
+            count = pos - self.gap_start
+            self._shift(self.gap_start, self.gap_end, count)
+            self.gap_start += count
+            self.gap_end += count
+
+    def move_left(self):
+        """Move the cursor one character left, returning False if it is at the start."""
+        if self.gap_start == 0:
+            return False
+        self.move_to(self.gap_start - 1)
+        return True
+
+    def move_right(self):
+        """Move the cursor one character right, returning False if it is at the end."""
+        if self.gap_end == len(self.buffer):
+            return False
+        self.move_to(self.gap_start + 1)
+        return True
+
+    def visible_slice(self, start, end):
+        """Return the text between positions `start` and `end` as bytes, skipping over the gap."""
+        end = min(end, len(self))
+        if start >= end:
+            return b""
+        gap_size = self.gap_end - self.gap_start
+        if end <= self.gap_start:
+            return bytes(self.buffer[start:end])
+        if start >= self.gap_start:
+            return bytes(self.buffer[start + gap_size:end + gap_size])
+        return bytes(self.buffer[start:self.gap_start]) + bytes(self.buffer[self.gap_end:end + gap_size])
+
+    def clear(self):
+        """Empty the buffer. An empty gap buffer is all gap, so no bytes need zeroing."""
+        self.gap_start = 0
+        self.gap_end = len(self.buffer)
+
+    def load_bytes(self):
+        """
+        Return a writable view of the whole buffer to read new text into.
+
+        Follow with `loaded` once the number of bytes read is known.
+        """
+        return memoryview(self.buffer)
+
+    def loaded(self, size):
+        """Take the first `size` bytes of the buffer as the text, with the cursor after them."""
+        self.gap_start = size
+        self.gap_end = len(self.buffer)
+
+    def dump_bytes(self):
+        """
+        Return a view of the text without copying it.
+
+        This moves the gap, and so the cursor, to the end of the text.
+        """
+        self.move_to(len(self))
+        return memoryview(self.buffer)[:self.gap_start]
+
+    def close(self):
+        """Release the buffer memory. The GapBuffer can't be used afterwards."""
+        del self._buffer_c  # The raw view holds an export that would stop the mapping from closing
+        self.buffer.close()
+
+    def _shift(self, dst, src, count):
+        """Move `count` bytes of the buffer from `src` to `dst` in place, without a temporary copy."""
+        ctypes.memmove(self._buffer_addr + dst, self._buffer_addr + src, count)
@@ -1,5 +1,58 @@
+import fcntl
+import os
+import selectors
+import time
+from collections import deque
 import evdev
 
+# Shifted key mappings for characters, built once at import
+_SHIFT_MAP = {
+    "KEY_A": "A", "KEY_B": "B", "KEY_C": "C", "KEY_D": "D", "KEY_E": "E",
+    "KEY_F": "F", "KEY_G": "G", "KEY_H": "H", "KEY_I": "I", "KEY_J": "J",
+    "KEY_K": "K", "KEY_L": "L", "KEY_M": "M", "KEY_N": "N", "KEY_O": "O",
+    "KEY_P": "P", "KEY_Q": "Q", "KEY_R": "R", "KEY_S": "S", "KEY_T": "T",
+    "KEY_U": "U", "KEY_V": "V", "KEY_W": "W", "KEY_X": "X", "KEY_Y": "Y",
+    "KEY_Z": "Z", "KEY_1": "!", "KEY_2": "@", "KEY_3": "#", "KEY_4": "$",
+    "KEY_5": "%", "KEY_6": "^", "KEY_7": "&", "KEY_8": "*", "KEY_9": "(",
+    "KEY_0": ")", "KEY_MINUS": "_", "KEY_EQUAL": "+", "KEY_LEFTBRACE": "{",
+    "KEY_RIGHTBRACE": "}", "KEY_SEMICOLON": ":", "KEY_APOSTROPHE": "\"",
+    "KEY_GRAVE": "~", "KEY_BACKSLASH": "|", "KEY_COMMA": "<", "KEY_DOT": ">",
+    "KEY_SLASH": "?"
+}
+
+# Unshifted or lowercase key mappings for characters
+_LOWER_MAP = {
+    "KEY_A": "a", "KEY_B": "b", "KEY_C": "c", "KEY_D": "d", "KEY_E": "e",
+    "KEY_F": "f", "KEY_G": "g", "KEY_H": "h", "KEY_I": "i", "KEY_J": "j",
+    "KEY_K": "k", "KEY_L": "l", "KEY_M": "m", "KEY_N": "n", "KEY_O": "o",
+    "KEY_P": "p", "KEY_Q": "q", "KEY_R": "r", "KEY_S": "s", "KEY_T": "t",
+    "KEY_U": "u", "KEY_V": "v", "KEY_W": "w", "KEY_X": "x", "KEY_Y": "y",
+    "KEY_Z": "z", "KEY_1": "1", "KEY_2": "2", "KEY_3": "3", "KEY_4": "4",
+    "KEY_5": "5", "KEY_6": "6", "KEY_7": "7", "KEY_8": "8", "KEY_9": "9",
+    "KEY_0": "0", "KEY_MINUS": "-", "KEY_EQUAL": "=", "KEY_LEFTBRACE": "[",
+    "KEY_RIGHTBRACE": "]", "KEY_SEMICOLON": ";", "KEY_APOSTROPHE": "'",
+    "KEY_GRAVE": "`", "KEY_BACKSLASH": "\\", "KEY_COMMA": ",", "KEY_DOT": ".",
+    "KEY_SLASH": "/"
+}
+
+
+def _code_table(char_map):
+    """Build a list indexed by evdev key code, holding the character or key name for each code."""
+    table = [None] * (evdev.ecodes.KEY_MAX + 1)
+    for code, name in evdev.ecodes.KEY.items():
+        if code > evdev.ecodes.KEY_MAX:  # KEY_CNT is in the names too, but isn't a key
+            continue
+        if isinstance(name, list):  # Codes with several names, use the first one
+            name = name[0]
+        table[code] = char_map.get(name, name)
+    return table
+
+
+_KEY_TABLES = (_code_table(_LOWER_MAP), _code_table(_SHIFT_MAP))  # Indexed by the shift state (False/True)
+_SHIFT_CODES = (evdev.ecodes.KEY_LEFTSHIFT, evdev.ecodes.KEY_RIGHTSHIFT)
+_CTRL_CODES = (evdev.ecodes.KEY_LEFTCTRL, evdev.ecodes.KEY_RIGHTCTRL)
+
+
 class KeyboardInput:
     def __init__(self):
         # Find the input device for the keyboard
@@ -12,57 +65,63 @@ class KeyboardInput:
 
         if not self.keyboard:
             raise Exception("No keyboard found")
+
+        # Nonblocking, so a read only ever takes what is already queued; grabbing keeps the
+        # keystrokes from also reaching the console
+        flags = fcntl.fcntl(self.keyboard.fd, fcntl.F_GETFL)
+        fcntl.fcntl(self.keyboard.fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        self.keyboard.grab()
         
         self.shift_pressed = False  # Track the state of the shift key
         self.control_pressed = False  # Track the state of the control key
+        self._events = deque()  # Events read from the device but not handled yet
+        self._selector = selectors.DefaultSelector()  # Wakes get_key only when the device has input
+        self._selector.register(self.keyboard.fd, selectors.EVENT_READ)
+
+    def get_key(self, timeout=None):
+        """
+        Get input from the USB keyboard.
+
+        :param timeout: Seconds to wait for a key press, or None to wait forever
+        :return: The key pressed, or None if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if not self._events:
+                # Sleep until the device has input instead of polling it
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not self._selector.select(remaining):
+                    return None
+                try:
+                    self._events.extend(self.keyboard.read())  # Take every queued event in one read
+                except BlockingIOError:
+                    continue  # Woken without any events after all, wait again
+            event = self._events.popleft()
+            if event.type != evdev.ecodes.EV_KEY:
+                continue
+
+            # Use the raw integer code, evdev.categorize would build a KeyEvent for every event
+            code = event.code
+            if code in _SHIFT_CODES:
+                self.shift_pressed = event.value != 0  # Track shift key press state, repeats included
+            elif code in _CTRL_CODES:
+                self.control_pressed = event.value != 0  # Track control key press state, repeats included
+
+            if event.value == 1 and code <= evdev.ecodes.KEY_MAX:  # Key press event
+                key = _KEY_TABLES[self.shift_pressed][code]
+                if key is not None:
+                    return key
+
+    def close(self):
+        """Release the keyboard so its keystrokes go back to the console."""
+        self._selector.close()
+        self.keyboard.ungrab()
+        self.keyboard.close()
 
-    def get_key(self):
-        """Get input from the USB keyboard."""
-        for event in self.keyboard.read_loop():
-            if event.type == evdev.ecodes.EV_KEY:
-                key_event = evdev.categorize(event)
-                
-                if key_event.keycode == "KEY_LEFTSHIFT" or key_event.keycode == "KEY_RIGHTSHIFT":
-                    self.shift_pressed = event.value == 1  # Track shift key press state
-                elif key_event.keycode == "KEY_LEFTCTRL" or key_event.keycode == "KEY_RIGHTCTRL":
-                    self.control_pressed = event.value == 1  # Track control key press state
-
-                if event.value == 1:  # Key press event
-                    key = key_event.keycode
-                    return self.modify_key(key)
-
-    def modify_key(self, key):
-        """Adjust key output based on whether the shift or control key is pressed."""
-        if self.shift_pressed:
-            # Handle upper-case letters or special characters when shift is pressed
-            shift_map = {
-                # Shifted key mappings for characters
-                "KEY_A": "A", "KEY_B": "B", "KEY_C": "C", "KEY_D": "D", "KEY_E": "E",
-                "KEY_F": "F", "KEY_G": "G", "KEY_H": "H", "KEY_I": "I", "KEY_J": "J",
-                "KEY_K": "K", "KEY_L": "L", "KEY_M": "M", "KEY_N": "N", "KEY_O": "O",
-                "KEY_P": "P", "KEY_Q": "Q", "KEY_R": "R", "KEY_S": "S", "KEY_T": "T",
-                "KEY_U": "U", "KEY_V": "V", "KEY_W": "W", "KEY_X": "X", "KEY_Y": "Y",
-                "KEY_Z": "Z", "KEY_1": "!", "KEY_2": "@", "KEY_3": "#", "KEY_4": "$",
-                "KEY_5": "%", "KEY_6": "^", "KEY_7": "&", "KEY_8": "*", "KEY_9": "(",
-                "KEY_0": ")", "KEY_MINUS": "_", "KEY_EQUAL": "+", "KEY_LEFTBRACE": "{",
-                "KEY_RIGHTBRACE": "}", "KEY_SEMICOLON": ":", "KEY_APOSTROPHE": "\"",
-                "KEY_GRAVE": "~", "KEY_BACKSLASH": "|", "KEY_COMMA": "<", "KEY_DOT": ">",
-                "KEY_SLASH": "?"
-            }
-            return shift_map.get(key, key)
-        else:
-            # Return the unshifted or lowercase equivalent
-            lower_map = {
-                "KEY_A": "a", "KEY_B": "b", "KEY_C": "c", "KEY_D": "d", "KEY_E": "e",
-                "KEY_F": "f", "KEY_G": "g", "KEY_H": "h", "KEY_I": "i", "KEY_J": "j",
-                "KEY_K": "k", "KEY_L": "l", "KEY_M": "m", "KEY_N": "n", "KEY_O": "o",
-                "KEY_P": "p", "KEY_Q": "q", "KEY_R": "r", "KEY_S": "s", "KEY_T": "t",
-                "KEY_U": "u", "KEY_V": "v", "KEY_W": "w", "KEY_X": "x", "KEY_Y": "y",
-                "KEY_Z": "z", "KEY_1": "1", "KEY_2": "2", "KEY_3": "3", "KEY_4": "4",
-                "KEY_5": "5", "KEY_6": "6", "KEY_7": "7", "KEY_8": "8", "KEY_9": "9",
-                "KEY_0": "0", "KEY_MINUS": "-", "KEY_EQUAL": "=", "KEY_LEFTBRACE": "[",
-                "KEY_RIGHTBRACE": "]", "KEY_SEMICOLON": ";", "KEY_APOSTROPHE": "'",
-                "KEY_GRAVE": "`", "KEY_BACKSLASH": "\\", "KEY_COMMA": ",", "KEY_DOT": ".",
-                "KEY_SLASH": "/"
-            }
-            return lower_map.get(key, key)
+    def drain(self):
+        """Yield the keys that are already waiting, without blocking for more."""
+        while True:
+            key = self.get_key(timeout=0)
+            if key is None:
+                return
+            yield key
@@ -0,0 +1,122 @@
+''' Tests for the GapBuffer text buffer, checked against a plain list of bytes. '''
+import random
+
+import pytest
+
+from gap_buffer import GapBuffer
+
+SIZE = 16  # Small, so the random edits keep filling the buffer up
+
+
+class ListModel:
+    """The same editing operations on a list of bytes, where the cursor is just an index."""
+
+    def __init__(self, size):
+        self.size = size
+        self.text = []
+        self.cursor = 0
+
+    def insert(self, char, overwrite=False):
+        if overwrite and self.cursor < len(self.text):
+            del self.text[self.cursor]
+        if len(self.text) == self.size:
+            return False
+        self.text.insert(self.cursor, ord(char))
+        self.cursor += 1
+        return True
+
+    def delete(self):
+        if self.cursor == 0:
+            return False
+        self.cursor -= 1
+        del self.text[self.cursor]
+        return True
+
+    def move_to(self, pos):
+        self.cursor = max(0, min(pos, len(self.text)))
+
+
+def assert_same(buffer, model):
+    assert len(buffer) == len(model.text)
+    assert buffer.cursor == model.cursor
+    assert [buffer[pos] for pos in range(len(buffer))] == model.text
+
+
+@pytest.fixture
+def buffer():
+    buffer = GapBuffer(SIZE)
+    yield buffer
+    buffer.close()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_edits_match_list_model(buffer, seed):
+    rng = random.Random(seed)
+    model = ListModel(SIZE)
+    for _ in range(500):
+        op = rng.randrange(6)
+        if op == 0:
+            char = rng.choice("ab\n ")
+            overwrite = rng.random() < 0.3
+            assert buffer.insert(char, overwrite) == model.insert(char, overwrite)
+        elif op == 1:
+            assert buffer.delete() == model.delete()
+        elif op == 2:
+            pos = rng.randrange(-2, SIZE + 3)  # Out of range positions are clamped
+            buffer.move_to(pos)
+            model.move_to(pos)
+        elif op == 3:
+            moved = model.cursor > 0
+            assert buffer.move_left() == moved
+            model.move_to(model.cursor - moved)
+        elif op == 4:
+            moved = model.cursor < len(model.text)
+            assert buffer.move_right() == moved
+            model.move_to(model.cursor + moved)
+        else:
+            start = rng.randrange(SIZE + 2)
+            end = rng.randrange(SIZE + 2)
+            expected = bytes(model.text[start:min(end, len(model.text))]) if start < end else b""
+            assert buffer.visible_slice(start, end) == expected
+        assert_same(buffer, model)
+
+
+def test_overwrite_at_end_of_text_appends(buffer):
+    for char in "abc":
+        buffer.insert(char)
+    assert buffer.insert("d", overwrite=True)
+    assert buffer.visible_slice(0, SIZE) == b"abcd"
+
+
+def test_overwrite_replaces_in_a_full_buffer(buffer):
+    for _ in range(SIZE):
+        buffer.insert("a")
+    assert not buffer.insert("b")
+    buffer.move_to(0)
+    assert buffer.insert("b", overwrite=True)
+    assert buffer.visible_slice(0, SIZE) == b"b" + b"a" * (SIZE - 1)
+
+
+def test_dump_and_load_round_trip(buffer):
+    for char in "hello":
+        buffer.insert(char)
+    buffer.move_to(2)
+    assert bytes(buffer.dump_bytes()) == b"hello"
+    assert buffer.cursor == 5  # dump_bytes moves the gap to the end
+
+    view = buffer.load_bytes()
+    view[:3] = b"new"
+    del view  # Release the export before the fixture closes the buffer
+    buffer.loaded(3)
+    assert buffer.visible_slice(0, SIZE) == b"new"
+    assert buffer.cursor == 3
+
+
+def test_clear_empties_the_buffer(buffer):
+    for char in "abc":
+        buffer.insert(char)
+    buffer.move_to(1)
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.cursor == 0
+    assert buffer.visible_slice(0, SIZE) == b""
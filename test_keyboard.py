@@ -0,0 +1,19 @@
+''' Smoke tests for the key code tables in keyboard.py. '''
+import pytest
+
+evdev = pytest.importorskip("evdev")
+
+import keyboard  # noqa: E402, needs evdev
+
+
+def test_tables_cover_every_key_code():
+    for table in keyboard._KEY_TABLES:
+        assert len(table) == evdev.ecodes.KEY_MAX + 1
+
+
+def test_tables_translate_characters():
+    lower, shifted = keyboard._KEY_TABLES
+    assert lower[evdev.ecodes.KEY_A] == "a"
+    assert shifted[evdev.ecodes.KEY_A] == "A"
+    assert shifted[evdev.ecodes.KEY_1] == "!"
+    assert lower[evdev.ecodes.KEY_ENTER] == "KEY_ENTER"
@@ -0,0 +1,49 @@
+''' Tests for the display diff in VFDEditor.py, the fallback one unless vfd_core is built. '''
+import random
+
+import pytest
+
+pytest.importorskip("RPi.GPIO")  # VFDEditor imports the VFD and keyboard drivers
+pytest.importorskip("evdev")
+
+from VFDEditor import VFDWordProcessor, diff_runs  # noqa: E402
+
+SCREEN = VFDWordProcessor.SCREEN
+
+
+def walk_runs(new, old, merge_gap):
+    """Changed cell ranges found by comparing every cell, merging runs at most `merge_gap` cells apart."""
+    runs = []
+    for i in range(len(new)):
+        if new[i] == old[i]:
+            continue
+        if runs and i - runs[-1][1] <= merge_gap:
+            runs[-1] = (runs[-1][0], i + 1)
+        else:
+            runs.append((i, i + 1))
+    return runs
+
+
+def test_equal_frames_have_no_runs():
+    frame = bytes(range(SCREEN))
+    assert diff_runs(frame, bytearray(frame), 3) == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_changes_match_cell_walk(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        old = bytearray(rng.choice(b" ab") for _ in range(SCREEN))
+        new = bytearray(old)
+        for _ in range(rng.randrange(1, 8)):
+            new[rng.randrange(SCREEN)] ^= rng.randrange(1, 256)  # Always a different byte
+        merge_gap = rng.randrange(6)
+        assert diff_runs(bytes(new), old, merge_gap) == walk_runs(new, old, merge_gap)
+
+
+def test_changes_in_first_and_last_cells():
+    old = bytearray(SCREEN)
+    new = bytearray(old)
+    new[0] = new[SCREEN - 1] = 0x41
+    assert diff_runs(bytes(new), old, 0) == [(0, 1), (SCREEN - 1, SCREEN)]
+    assert diff_runs(bytes(new), old, SCREEN) == [(0, SCREEN)]
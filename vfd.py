@@ -1,5 +1,27 @@
+import ctypes
+import errno
+import mmap
+from array import array
+import os
+import resource
 import time
 import RPi.GPIO as GPIO
+
+try:
+    import pigpio  # Optional, sends whole writes as DMA timed waveforms when pigpiod is running
+except ImportError:
+    pigpio = None
+
+try:
+    import spidev  # Optional, only needed for SpiBackend
+except ImportError:
+    spidev = None
+
+try:
+    from vfd_core import strobe_bytes  # Compiled register loop, see vfd_core.pyx
+except ImportError:
+    strobe_bytes = None
+
 # VFD Setup GPIO
 GPIO.setmode(GPIO.BCM)  # Use BCM GPIO numbering
 GPIO.setwarnings(False)
@@ -17,44 +39,530 @@ VFD_DC3 = 0x13  # Underline cursor.
 VFD_DC4 = 0x14  # Block cursor.
 VFD_DC5 = 0x15  # Cursor off.
 VFD_DC6 = 0x16  # Blinking mode.
+VFD_SUB = 0x1A  # SUB – Brightness adjustment, followed by the level.
+
+# GPIO pins (BCM numbering)
+DATA_PINS = (9, 10, 22, 27, 17, 4, 3, 2)  # Data bits 0-7
+WR_PIN = 11  # Write pin
+AD_PIN = 5  # AD pin
+RD_PIN = 6  # Read pin
+CS_PIN = 13  # Chip Select pin
+
+STROBE_NS = 1000  # Time the WR strobe is held low for, in nanoseconds; the data is set up before it
+READ_STROBE_NS = 50000  # Time RD is held low before the data pins are read, for the display's output delay
+
+SLEEP_STROBE_NS = 50000  # Strobe period when sleeping instead of spinning, above the cost of the sleep itself
+
+RESET_SETTLE = 0.01  # Seconds the display needs after VFD_RS before it takes the next byte
+
+# BCM2835 GPIO register offsets in bytes, from the start of /dev/gpiomem
+GPSET0 = 0x1C  # Writing a 1 bit drives that pin high
+GPCLR0 = 0x28  # Writing a 1 bit drives that pin low
+GPLEV0 = 0x34  # Reads the level of every pin
+
+REALTIME_PRIORITY = 10  # SCHED_FIFO priority, below the kernel's interrupt threads at 50
+MCL_CURRENT = 1  # mlockall flags from <sys/mman.h>
+MCL_FUTURE = 2
+CLOCK_MONOTONIC = 1  # clock_nanosleep arguments from <time.h>, the clock behind time.monotonic_ns
+TIMER_ABSTIME = 1
+
+# Data pin levels for every byte value, least significant bit first, so a byte goes out in one GPIO.output call
+_BYTE_BITS = tuple(tuple((byte >> i) & 0x01 for i in range(8)) for byte in range(256))
+
+_libc = ctypes.CDLL(None, use_errno=True)
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+def _use_realtime_scheduling():
+    """
+    Keeps the scheduler and page faults from stretching a strobe, where the system allows it.
+
+    Both steps need root or the matching capability; without it they are skipped and the display
+    works the same, just with more timing jitter.
+    """
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(REALTIME_PRIORITY))
+    except (AttributeError, OSError):
+        pass  # Not permitted, keep the normal scheduler
+
+    # Locking future pages too makes allocations fail once the lock limit is hit, so only lock where it doesn't
+    # apply: root isn't bound by it, anyone else only when it's unlimited
+    soft, _ = resource.getrlimit(resource.RLIMIT_MEMLOCK)
+    if os.geteuid() == 0 or soft == resource.RLIM_INFINITY:
+        _libc.mlockall(MCL_CURRENT | MCL_FUTURE)  # A failure returns -1 and just leaves the memory unlocked
+
+
+def _delay_ns(ns):
+    """
+    Busy-waits for a short strobe delay. time.sleep overshoots delays this short by far more
+    than the delay itself, so spin on the clock instead.
+
+    :param ns: The time to wait in nanoseconds
+    """
+    clock = time.perf_counter_ns
+    end = clock() + ns
+    while clock() < end:
+        pass
+
+
+def _sleep_until(deadline_ns):
+    """
+    Sleeps until an absolute time.monotonic_ns deadline, returning at once if it has passed.
+
+    :param deadline_ns: The time to wake up at in nanoseconds
+    """
+    deadline = _Timespec(*divmod(deadline_ns, 1000000000))
+    while _libc.clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(deadline), None) == errno.EINTR:
+        pass  # Interrupted by a signal, the deadline still holds so sleep again
+
+
+class _DeadlineSleep:
+    """
+    Strobe delay that sleeps instead of spinning, for a Pi whose CPU is shared with other work.
+
+    Each wait sleeps to a deadline one period after the previous one rather than for a period from now,
+    so a sleep that overshoots is made up by the next and a whole write keeps to its pace. A wait never
+    ends sooner than the time asked for, though, however long ago the previous deadline was.
+    """
+
+    def __init__(self, period_ns=SLEEP_STROBE_NS):
+        """
+        :param period_ns: The shortest time between two strobes
+        """
+        self._period = period_ns
+        self._next_deadline = 0
+
+    def __call__(self, ns):
+        """
+        Waits for the next strobe deadline.
+
+        :param ns: The strobe time asked for in nanoseconds, the least this waits
+        """
+        now = time.monotonic_ns()
+        # The pace only shortens a wait down to `ns`, so an RD or WR strobe is still held low for that long
+        deadline = max(self._next_deadline + max(ns, self._period), now + ns)
+        _sleep_until(deadline)
+        self._next_deadline = deadline
+
+
+class GpioRegisters:
+    """
+    Direct access to the GPIO set and clear registers through /dev/gpiomem.
+
+    One register store changes any number of pins at once, without a call into RPi.GPIO per pin.
+    """
+
+    def __init__(self, path="/dev/gpiomem"):
+        """
+        Maps the GPIO registers.
+
+        :param path: The GPIO memory device, which needs no root access on Raspberry Pi OS
+        :raises OSError: If the device can't be opened or mapped
+        """
+        fd = os.open(path, os.O_RDWR | os.O_SYNC)
+        try:
+            self._map = mmap.mmap(fd, mmap.PAGESIZE)
+        finally:
+            os.close(fd)  # The mapping stays valid without the file
+        self.words = memoryview(self._map).cast("I")  # 32 bit register access, also used by vfd_core
+
+    def set(self, mask):
+        """Drives every pin whose bit is set in `mask` high."""
+        self.words[GPSET0 // 4] = mask
+
+    def clear(self, mask):
+        """Drives every pin whose bit is set in `mask` low."""
+        self.words[GPCLR0 // 4] = mask
+
+    def levels(self):
+        """Returns the levels of all pins, one bit per pin."""
+        return self.words[GPLEV0 // 4]
+
+    def close(self):
+        """Unmaps the registers."""
+        self.words.release()
+        self._map.close()
+
+
+class PigpioWaves:
+    """
+    Sends runs of data bytes as pigpio waveforms, which the DMA engine clocks out with exact strobe
+    timing while the CPU is free.
+
+    A waveform is built once for each printable ASCII byte; other bytes aren't sent this way.
+    """
+    CHAIN_MAX = 512  # Wave ids per wave_chain call, under pigpio's 600 byte chain limit
+
+    def __init__(self, set_masks, clr_masks, wr_mask, strobe_us):
+        """
+        Connects to pigpiod and builds the waveforms.
+
+        :param set_masks: The GPIO set mask for each data byte value
+        :param clr_masks: The GPIO clear mask for each data byte value
+        :param wr_mask: The mask of the WR pin
+        :param strobe_us: How long to hold WR low, and then high, for each byte
+        :raises OSError: If pigpiod isn't running
+        :raises pigpio.error: If pigpiod can't build the waveforms, e.g. when it is out of wave resources
+        """
+        self._pi = pigpio.pi(show_errors=False)  # The connected check below handles a missing pigpiod
+        if not self._pi.connected:
+            raise OSError("pigpiod is not running")
+        self._strobe_us = strobe_us
+        self._waves = {}
+        try:
+            self._pi.wave_clear()
+            for byte in range(0x20, 0x7F):  # Only 95 waves, so no wave id reaches 255, a chain command byte
+                self._pi.wave_add_generic([
+                    pigpio.pulse(set_masks[byte], clr_masks[byte], strobe_us),  # Data out while WR is high
+                    pigpio.pulse(0, wr_mask, strobe_us),  # WR low
+                    pigpio.pulse(wr_mask, 0, strobe_us),  # WR high latches the byte
+                ])
+                self._waves[byte] = self._pi.wave_create()
+        except pigpio.error:
+            self.close()  # Don't leave half the waveforms or the connection behind
+            raise
+
+    def send(self, data):
+        """
+        Sends a run of data bytes and waits for the waveforms to finish.
+
+        :param data: The bytes to send
+        :return: False without sending anything if a byte has no waveform
+        """
+        try:
+            chain = [self._waves[byte] for byte in data]
+        except KeyError:
+            return False
+        pi = self._pi
+        for start in range(0, len(chain), self.CHAIN_MAX):
+            part = chain[start:start + self.CHAIN_MAX]
+            pi.wave_chain(part)
+            time.sleep(len(part) * 2 * self._strobe_us / 1e6)  # Most of the transmit time, then poll
+            while pi.wave_tx_busy():
+                pass
+        return True
+
+    def close(self):
+        """Deletes the waveforms and disconnects from pigpiod."""
+        self._pi.wave_clear()
+        self._pi.stop()
+
+
+class GpioBackend:
+    """
+    Drives the VFD's parallel bus with one GPIO pin per data bit.
+
+    Writes go through the /dev/gpiomem registers, or without them pigpio waveforms for text when pigpiod
+    is running, and fall back to RPi.GPIO calls.
+    """
+
+    def __init__(self, spin=True):
+        '''
+        Initializes the GPIO pins for the VFD
+
+        :param spin: Busy-wait the strobes for the fastest writes, or False to sleep them and leave the CPU free
+        '''
+        # GPIO pin setup, an immutable tuple so the hot loops can bind it once
+        self.data_pins = DATA_PINS
+        self.wr = WR_PIN
+        self.ad = AD_PIN
+        self.rd = RD_PIN
+        self.cs = CS_PIN
 
-class VFD:
-    def __init__(self):
-        '''Initializes the hardware for the VFD display'''
-        # GPIO pin setup (BCM numbering)
-        self.data_pins = [9, 10, 22, 27, 17, 4, 3, 2]
-        self.wr = 11  # Write pin
-        self.ad = 5  # AD pin
-        self.rd = 6  # Read pin 
-        self.cs = 13  # Chip Select pin
-        
         # Set pins as output
-        for pin in self.data_pins:
-            GPIO.setup(pin, GPIO.OUT, initial=GPIO.LOW)
+        GPIO.setup(self.data_pins, GPIO.OUT, initial=GPIO.LOW)
         GPIO.setup(self.wr, GPIO.OUT, initial=GPIO.HIGH)
         GPIO.setup(self.ad, GPIO.OUT, initial=GPIO.LOW)
         GPIO.setup(self.rd, GPIO.OUT, initial=GPIO.HIGH)
         GPIO.setup(self.cs, GPIO.OUT, initial=GPIO.LOW)
-    
+        self._ad_state = False  # Last level written to AD, so runs of data bytes skip rewriting it
+        self._last_byte = -1  # Byte on the data pins, so repeats only need a WR strobe; -1 when unknown
+        self._data_is_output = True  # Direction of the data pins, only switched around reads
+        self._delay = _delay_ns if spin else _DeadlineSleep()
+
+        # Write the pins straight to the GPIO registers where possible, RPi.GPIO still sets their direction
+        try:
+            self._regs = GpioRegisters()
+        except OSError:
+            self._regs = None  # Not a BCM2835 style Pi, or no access to /dev/gpiomem
+
+        # Register masks for every byte value, indexed [is_command][byte]: the clear mask drops the data
+        # pins of the 0 bits and AD for data, the set mask raises the 1 bits and AD for commands
+        ad_mask = 1 << self.ad
+        wr_mask = 1 << self.wr
+        data_mask = sum(1 << pin for pin in self.data_pins)
+        bit_masks = [
+            sum(1 << pin for bit, pin in zip(_BYTE_BITS[byte], self.data_pins) if bit) for byte in range(256)
+        ]
+        self._set_masks = (tuple(bit_masks), tuple(mask | ad_mask for mask in bit_masks))
+        self._clr_masks = (
+            tuple(ad_mask | (data_mask & ~mask) for mask in bit_masks),
+            tuple(data_mask & ~mask for mask in bit_masks),
+        )
+        self._wr_mask = wr_mask
+        if self._regs and strobe_bytes and spin:
+            # The compiled loop takes the data masks as typed arrays
+            self._data_masks = (array("I", self._set_masks[False]), array("I", self._clr_masks[False]))
+
+        # Without the registers, hand runs of text to the DMA engine when pigpiod is running. With them the
+        # register stores are faster than the socket round trips a waveform takes, so they stay in use
+        self._waves = None
+        if pigpio and not self._regs:
+            try:
+                self._waves = PigpioWaves(
+                    self._set_masks[False], self._clr_masks[False], wr_mask, max(1, STROBE_NS // 1000)
+                )
+            except (OSError, pigpio.error):
+                pass
+
+    def send_frame(self, frame):
+        """
+        Sends a sequence of command and data bytes to the VFD display in one loop.
+
+        :param frame: An iterable of (is_command, byte) pairs
+        """
+        delay = self._delay
+        ad_state, last_byte = self._ad_state, self._last_byte
+        if self._regs:
+            clear_pins, set_pins = self._regs.clear, self._regs.set
+            clr_masks, set_masks = self._clr_masks, self._set_masks
+            wr_mask = self._wr_mask
+            for is_command, byte in frame:
+                if byte != last_byte or is_command != ad_state:
+                    # Two stores set AD and all 8 data pins, skipped when they already hold this byte
+                    clear_pins(clr_masks[is_command][byte])
+                    set_pins(set_masks[is_command][byte])
+                    ad_state, last_byte = is_command, byte
+                # A short WR pulse; the VFD latches the data when WR goes high
+                clear_pins(wr_mask)
+                delay(STROBE_NS)
+                set_pins(wr_mask)
+        else:
+            out = GPIO.output
+            pins, ad, wr = self.data_pins, self.ad, self.wr
+            for is_command, byte in frame:
+                if is_command != ad_state:
+                    out(ad, is_command)
+                    ad_state = is_command
+                if byte != last_byte:
+                    out(pins, _BYTE_BITS[byte])  # All 8 data pins in one call, set up before the strobe
+                    last_byte = byte
+                out(wr, 0)
+                delay(STROBE_NS)
+                out(wr, 1)
+        self._ad_state, self._last_byte = ad_state, last_byte
+
+    def write_bytes(self, data):
+        """
+        Sends a run of data bytes to the VFD display in one tight loop.
+
+        :param data: The bytes to send
+        """
+        if not data:
+            return
+        if self._waves and self._waves.send(data):
+            self._ad_state, self._last_byte = False, data[-1]  # The waveforms leave AD low and the last byte out
+            return
+        if self._regs and strobe_bytes and self._delay is _delay_ns:  # The compiled loop always spins
+            strobe_bytes(self._regs.words, *self._data_masks, self._wr_mask, data, STROBE_NS)
+            self._ad_state, self._last_byte = False, data[-1]  # As does the compiled loop
+            return
+
+        delay = self._delay
+        last_byte = self._last_byte
+        if self._regs:
+            clear_pins, set_pins = self._regs.clear, self._regs.set
+            clr_masks, set_masks = self._clr_masks[False], self._set_masks[False]
+            wr_mask = self._wr_mask
+            if self._ad_state:
+                last_byte = -1  # The mask stores lower AD too
+            for byte in data:
+                if byte != last_byte:  # Repeats of a byte, like runs of spaces, only need the strobe
+                    clear_pins(clr_masks[byte])
+                    set_pins(set_masks[byte])
+                    last_byte = byte
+                clear_pins(wr_mask)
+                delay(STROBE_NS)
+                set_pins(wr_mask)
+        else:
+            out = GPIO.output
+            pins, wr = self.data_pins, self.wr
+            if self._ad_state:
+                out(self.ad, 0)  # AD stays low for the whole run
+            for byte in data:
+                if byte != last_byte:  # Repeats of a byte, like runs of spaces, only need the strobe
+                    out(pins, _BYTE_BITS[byte])
+                    last_byte = byte
+                out(wr, 0)
+                delay(STROBE_NS)
+                out(wr, 1)
+        self._ad_state, self._last_byte = False, last_byte
+
+    def read_bytes(self, count, is_command=False):
+        """
+        Reads several bytes from the VFD display, switching the data pins to input only once.
+
+        :param count: The number of bytes to read
+        :param is_command: True if the bytes to be read are commands, False if they are data
+        :return: The bytes read
+        """
+        GPIO.output(self.ad, is_command)
+        self._ad_state = is_command
+        self._last_byte = -1  # The data pins are read from, so their output levels aren't relied on
+        self._set_data_dir(False)
+        result = bytearray(count)
+        out, read_pin, delay = GPIO.output, GPIO.input, self._delay
+        levels = self._regs.levels if self._regs else None
+        pins = tuple(enumerate(self.data_pins))
+        rd = self.rd
+        try:
+            for n in range(count):
+                out(rd, 0)  # Enable read
+                delay(READ_STROBE_NS)
+
+                # Read the byte from data pins, in one register load when the registers are mapped
+                byte = 0
+                if levels:
+                    level_bits = levels()
+                    for i, pin in pins:
+                        byte |= ((level_bits >> pin) & 0x01) << i
+                else:
+                    for i, pin in pins:
+                        byte |= read_pin(pin) << i
+                result[n] = byte
+
+                out(rd, 1)  # Disable read
+        finally:
+            self._set_data_dir(True)  # Writes expect the data pins as outputs
+        return bytes(result)
+
+    def _set_data_dir(self, output):
+        """
+        Switches the data pins between output and input, if they aren't that way already.
+
+        :param output: True for output, False for input
+        """
+        if output != self._data_is_output:
+            GPIO.setup(self.data_pins, GPIO.OUT if output else GPIO.IN)  # All 8 pins in one call
+            self._data_is_output = output
+
+    def close(self):
+        """Releases the register mapping and the pigpio waveforms."""
+        if self._waves:
+            self._waves.close()
+        if self._regs:
+            self._regs.close()
+
+
+class SpiBackend:
+    """
+    Drives the VFD's data bus through a 74HC595 shift register on SPI, with one SPI byte per VFD byte.
+
+    The shift register's serial input and clock go to MOSI and SCLK, and its latch clock to the SPI chip
+    enable, so the byte appears on its outputs when the transfer ends. AD, WR, RD and CS stay on GPIO.
+    SPI bus 1 is the default because SPI0 shares GPIO 9-11 with the parallel wiring's data pins and WR.
+    """
+
+    def __init__(self, bus=1, device=0, speed_hz=8000000, spin=True):
+        """
+        Opens the SPI device and sets up the control pins.
+
+        :param bus: The SPI bus the shift register is on
+        :param device: The chip enable the shift register's latch is on
+        :param speed_hz: The SPI clock rate
+        :param spin: Busy-wait the strobes for the fastest writes, or False to sleep them and leave the CPU free
+        :raises OSError: If spidev isn't installed or the SPI device can't be opened
+        """
+        if spidev is None:
+            raise OSError("spidev is not installed")
+        self._spi = spidev.SpiDev()
+        self._spi.open(bus, device)
+        self._spi.max_speed_hz = speed_hz
+        self._spi.mode = 0
+
+        self.wr = WR_PIN
+        self.ad = AD_PIN
+        self.rd = RD_PIN
+        self.cs = CS_PIN
+        GPIO.setup(self.wr, GPIO.OUT, initial=GPIO.HIGH)
+        GPIO.setup(self.ad, GPIO.OUT, initial=GPIO.LOW)
+        GPIO.setup(self.rd, GPIO.OUT, initial=GPIO.HIGH)
+        GPIO.setup(self.cs, GPIO.OUT, initial=GPIO.LOW)
+        self._ad_state = False  # Last level written to AD, so runs of data bytes skip rewriting it
+        self._delay = _delay_ns if spin else _DeadlineSleep()
+
+    def send_frame(self, frame):
+        """
+        Sends a sequence of command and data bytes to the VFD display in one loop.
+
+        :param frame: An iterable of (is_command, byte) pairs
+        """
+        out, shift, delay = GPIO.output, self._spi.writebytes, self._delay
+        ad, wr = self.ad, self.wr
+        ad_state = self._ad_state
+        for is_command, byte in frame:
+            if is_command != ad_state:
+                out(ad, is_command)
+                ad_state = is_command
+            shift([byte])  # Latched onto the data bus when the transfer ends, before the strobe
+            out(wr, 0)
+            delay(STROBE_NS)
+            out(wr, 1)
+        self._ad_state = ad_state
+
+    def write_bytes(self, data):
+        """
+        Sends a run of data bytes to the VFD display in one tight loop.
+
+        :param data: The bytes to send
+        """
+        self.send_frame((False, byte) for byte in data)
+
+    def read_bytes(self, count, is_command=False):
+        """
+        Reading needs the data pins as inputs, which the shift register's outputs can't be.
+
+        :raises OSError: Always, this wiring has no way to read from the display
+        """
+        raise OSError("the 74HC595 on SPI only drives the data bus, it can't read from the display")
+
+    def close(self):
+        """Closes the SPI device."""
+        self._spi.close()
+
+
+class VFD:
+    _CLEAR_BUF = b" " * 80  # Written over every position to clear the screen
+
+    def __init__(self, backend=None):
+        '''
+        Initializes the hardware for the VFD display
+
+        :param backend: The bus driver, e.g. a SpiBackend, or None for the parallel GPIO wiring
+        '''
+        _use_realtime_scheduling()
+        self.backend = backend or GpioBackend()
+
     def init_display(self):
         '''Initializes the VFD display screen'''
         self.send_command(VFD_RS) # Reset display
-        time.sleep(0.2)          # Wait for reset
-        self.send_data(VFD_DC1) # Normal display mode
-        time.sleep(0.2)          # Wait for reset
-        self.send_data(VFD_DC6) # Blinking mode
-        
+        time.sleep(RESET_SETTLE)  # Wait for reset, once
+        self.send_frame(((False, VFD_DC1), (False, VFD_DC6)))  # Normal display mode, blinking mode
+
     def clear(self):
         '''
         Clears the VFD display and moves the cursor to the home position.
-        
+
         This method writes 80 spaces to the VFD and then moves the cursor to the
         home position (0,0).
         '''
-        
-        self.write(" " * 80)  # Clear all 80 positions of the VFD
+
+        self.backend.write_bytes(self._CLEAR_BUF)  # Clear all 80 positions of the VFD
         self.set_cursor(0)       # Set cursor position to 0
-    
+
     def send_command(self, cmd):
         """
         Sends a single byte command to the VFD display.
@@ -62,7 +570,7 @@ class VFD:
         :param cmd: The byte command to send
         """
         self.send_byte(cmd, is_command=True)
-    
+
     def send_data(self, data):
         """
         Sends a single byte of data to the VFD display.
@@ -70,7 +578,7 @@ class VFD:
         :param data: The byte of data to send
         """
         self.send_byte(data, is_command=False)
-    
+
     def send_byte(self, byte, is_command):
         """
         Sends a single byte to the VFD display.
@@ -78,19 +586,22 @@ class VFD:
         :param byte: The byte to send
         :param is_command: True if the byte is a command, False if it is data
         """
-        GPIO.output(self.ad, is_command)
-        GPIO.output(self.wr, 0)
-        for i in range(8):
-            GPIO.output(self.data_pins[i], (byte >> i) & 0x01)
-        time.sleep(0.00005)  # 50us delay
-        GPIO.output(self.wr, 1)
+        self.backend.send_frame(((is_command, byte),))
+
+    def send_frame(self, frame):
+        """
+        Sends a sequence of command and data bytes to the VFD display in one loop.
+
+        :param frame: An iterable of (is_command, byte) pairs
+        """
+        self.backend.send_frame(frame)
 
     def reset(self):
         '''Resets the VFD display. The display is reset to its power-on state, and the cursor is set to the home position.'''
         self.send_command(VFD_RS)
-        time.sleep(0.005)
+        time.sleep(RESET_SETTLE)
         self.clear()
-    
+
     def set_cursor(self, pos):
         """
         Sets the cursor position on the VFD display.
@@ -98,15 +609,26 @@ class VFD:
         :param pos: The position to set the cursor to (0-79)
         """
         self.send_command(pos)
-    
+
+    def write_at(self, pos, data):
+        """
+        Writes text starting at a screen position, as one cursor command followed by the data.
+
+        :param pos: The position to start writing at (0-79)
+        :param data: The text to write, as a string or bytes
+        """
+        self.set_cursor(pos)
+        self.write(data)
+
     def write(self, text):
         """
         Writes a string of text to the VFD display.
 
-        :param text: The string of text to write
+        :param text: The string of text to write, or bytes to send as they are
         """
-        for char in text:
-            self.send_data(ord(char))
+        if isinstance(text, str):
+            text = text.encode("ascii", "replace")  # Iterating bytes gives the byte values directly
+        self.backend.write_bytes(text)
 
     def set_brightness(self, level):
         """
@@ -114,8 +636,7 @@ class VFD:
 
         :param level: The brightness level to set (0-15)
         """
-        self.send_command(VFD_SUB)
-        self.send_data(level)
+        self.send_frame(((True, VFD_SUB), (False, level)))
 
     def get_byte(self, is_command):
         """
@@ -123,32 +644,24 @@ class VFD:
 
         :param is_command: True if the byte to be read is a command, False if it is data
         :return: The read byte
+        :raises OSError: If the backend's wiring can't read from the display
         """
-        
-        GPIO.output(self.ad, is_command)
-        GPIO.output(self.rd, 0)  # Enable read
-
-        # Set pins to input mode
-        for pin in self.data_pins:
-            GPIO.setup(pin, GPIO.IN)
+        return self.read_bytes(1, is_command)[0]
 
-        time.sleep(0.00005)  # 50us delay
-        
-        # Read the byte from data pins
-        byte = 0
-        for i in range(8):
-            byte |= GPIO.input(self.data_pins[i]) << i
-
-        GPIO.output(self.rd, 1)  # Disable read
-
-        # Set pins back to output mode
-        for pin in self.data_pins:
-            GPIO.setup(pin, GPIO.OUT)
+    def read_bytes(self, count, is_command=False):
+        """
+        Reads several bytes from the VFD display.
 
-        return byte
+        :param count: The number of bytes to read
+        :param is_command: True if the bytes to be read are commands, False if they are data
+        :return: The bytes read
+        :raises OSError: If the backend's wiring can't read from the display
+        """
+        return self.backend.read_bytes(count, is_command)
 
     def cleanup(self):
         """
         Clean up GPIO allocation.
         """
+        self.backend.close()
         GPIO.cleanup()
@@ -0,0 +1,84 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+""" Compiled display and GPIO helpers for the VFD Editor. Build on the Pi with: cythonize -3 --inplace vfd_core.pyx """
+
+
+cpdef list diff_runs(const unsigned char[::1] new, const unsigned char[::1] old, Py_ssize_t merge_gap):
+    """
+    Find the runs of cells that differ between two display frames.
+
+    :param new: The frame about to be displayed
+    :param old: The frame currently on the display
+    :param merge_gap: Runs separated by at most this many unchanged cells are merged into one
+    :return: A list of (start, end) ranges to rewrite
+    """
+    cdef list runs = []
+    cdef Py_ssize_t size = min(new.shape[0], old.shape[0])
+    cdef Py_ssize_t run_start = -1
+    cdef Py_ssize_t last_changed = -1
+    cdef Py_ssize_t i
+
+    for i in range(size):
+        if new[i] == old[i]:
+            continue
+        if run_start < 0:
+            run_start = i
+        elif i - last_changed - 1 > merge_gap:
+            runs.append((run_start, last_changed + 1))
+            run_start = i
+        last_changed = i
+    if run_start >= 0:
+        runs.append((run_start, last_changed + 1))
+    return runs
+
+
+cdef extern from *:
+    """
+    #include <time.h>
+
+    /* A volatile store, so the compiler can't merge or drop repeated writes to a register */
+    static inline void vfd_store(volatile unsigned int *reg, unsigned int value) { *reg = value; }
+
+    /* Spin until `ns` nanoseconds have passed on the monotonic clock */
+    static inline void vfd_spin_ns(long ns) {
+        struct timespec now, end;
+        clock_gettime(CLOCK_MONOTONIC, &end);
+        end.tv_nsec += ns;
+        while (end.tv_nsec >= 1000000000L) { end.tv_nsec -= 1000000000L; end.tv_sec++; }
+        do {
+            clock_gettime(CLOCK_MONOTONIC, &now);
+        } while (now.tv_sec < end.tv_sec || (now.tv_sec == end.tv_sec && now.tv_nsec < end.tv_nsec));
+    }
+    """
+    void vfd_store(unsigned int *reg, unsigned int value) nogil
+    void vfd_spin_ns(long ns) nogil
+
+cdef enum:
+    GPSET0_WORD = 7  # Register offsets in 32 bit words, the byte offsets 0x1C and 0x28 in vfd.py
+    GPCLR0_WORD = 10
+
+
+cpdef void strobe_bytes(unsigned int[::1] regs, const unsigned int[::1] set_masks,
+                        const unsigned int[::1] clr_masks, unsigned int wr_mask,
+                        const unsigned char[::1] data, long strobe_ns) noexcept:
+    """
+    Strobe a run of bytes out through the mapped GPIO registers.
+
+    :param regs: The GPIO registers, as mapped by vfd.GpioRegisters
+    :param set_masks: The GPSET0 mask for each byte value
+    :param clr_masks: The GPCLR0 mask for each byte value
+    :param wr_mask: The mask of the WR pin
+    :param data: The bytes to send
+    :param strobe_ns: How long to hold WR low, and then high, for each byte
+    """
+    cdef unsigned int *base = &regs[0]
+    cdef Py_ssize_t i
+    cdef unsigned char byte
+    with nogil:
+        for i in range(data.shape[0]):
+            byte = data[i]
+            vfd_store(base + GPCLR0_WORD, clr_masks[byte])  # Data out while WR is high
+            vfd_store(base + GPSET0_WORD, set_masks[byte])
+            vfd_store(base + GPCLR0_WORD, wr_mask)
+            vfd_spin_ns(strobe_ns)
+            vfd_store(base + GPSET0_WORD, wr_mask)  # WR high latches the byte
+            vfd_spin_ns(strobe_ns)  # Hold the data before the next byte changes it